@@ -1,5 +1,8 @@
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 
 def persist_thoughts_enabled() -> bool:
     """
@@ -23,6 +26,23 @@ def dynamic_tools_enabled() -> bool:
     return get_feature("DYNAMIC_TOOLS", False)
 
 
+def llm_tool_routing_enabled() -> bool:
+    """
+    Whether dynamic Tools are chosen by an LLM instead of by embedding similarity. Defaults to False.
+    """
+    return get_feature("LLM_TOOL_ROUTING", False)
+
+
+def tool_similarity_threshold() -> float:
+    """
+    Minimum cosine similarity between a message and a Tool's name and description for the Tool to be chosen
+    when routing by embedding similarity. Defaults to 0.3: with OpenAI text-embedding-3 models, short related
+    texts usually score above that and unrelated ones below it. Tune it against real messages for the
+    configured embedding model.
+    """
+    return get_float_setting("DYNAMIC_TOOLS_SIMILARITY_THRESHOLD", 0.3)
+
+
 def dynamic_rulesets_enabled() -> bool:
     """
     Whether the Agent will have dynamic rulesets based on the incoming user/channel/team/etc ids. Defaults to True
@@ -38,9 +58,32 @@ def thread_history_enabled() -> bool:
     return get_feature("THREAD_HISTORY", True)
 
 
+def prewarm_enabled() -> bool:
+    """
+    Whether the Griptape config, default Rulesets and Tools are loaded on a background thread at startup,
+    so the first request doesn't pay for them. Only worth enabling for long-lived processes that serve many events.
+    Defaults to False
+    """
+    return get_feature("PREWARM", False)
+
+
 def get_feature(feature: str, default: bool) -> bool:
     """
     Gets a feature from the environment.
     """
     default_str = "true" if default else "false"
     return os.getenv(f"FEATURE_{feature}", default_str).lower() == "true"
+
+
+def get_float_setting(setting: str, default: float) -> float:
+    """
+    Gets a numeric setting from the environment, falling back to the default if it is missing or invalid.
+    """
+    value = os.getenv(setting)
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning("Invalid value %r for %s, using %s", value, setting, default)
+        return default
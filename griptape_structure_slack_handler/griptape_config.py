@@ -1,16 +1,24 @@
+from __future__ import annotations
+
 import os
-from typing import Optional
+import threading
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from griptape.drivers import GriptapeCloudConversationMemoryDriver
 
-from griptape.configs import Defaults
-from griptape.configs.drivers import AzureOpenAiDriversConfig
-from griptape.drivers import (
-    GriptapeCloudConversationMemoryDriver,
-    GriptapeCloudRulesetDriver,
-)
+_thread_local = threading.local()
 
 
 def load_griptape_config() -> None:
     """Load the Default Griptape configuration. If no OPENAI_API_KEY is found, use Azure OpenAI drivers."""
+    from griptape.configs import Defaults
+    from griptape.configs.drivers import AzureOpenAiDriversConfig
+    from griptape.drivers import (
+        GriptapeCloudConversationMemoryDriver,
+        GriptapeCloudRulesetDriver,
+    )
+
     if "OPENAI_API_KEY" not in os.environ:
         Defaults.drivers_config = AzureOpenAiDriversConfig(
             api_key=os.environ["AZURE_OPENAI_API_KEY"],
@@ -21,6 +29,17 @@ def load_griptape_config() -> None:
     Defaults.drivers_config.conversation_memory_driver = GriptapeCloudConversationMemoryDriver()
 
 
-def set_thread_alias(thread_alias: Optional[str]) -> None:
-    """Set the thread alias for the conversation memory driver."""
-    Defaults.drivers_config.conversation_memory_driver.alias = thread_alias
+def get_conversation_memory_driver(thread_alias: Optional[str]) -> GriptapeCloudConversationMemoryDriver:
+    """
+    Get a conversation memory driver for the thread alias.
+    Each worker thread gets its own driver, which is reused for as long as that thread keeps asking for the same alias.
+    """
+    from griptape.drivers import GriptapeCloudConversationMemoryDriver
+
+    if thread_alias is None:
+        return GriptapeCloudConversationMemoryDriver()
+
+    if getattr(_thread_local, "alias", None) != thread_alias:
+        _thread_local.driver = GriptapeCloudConversationMemoryDriver(alias=thread_alias)
+        _thread_local.alias = thread_alias
+    return _thread_local.driver
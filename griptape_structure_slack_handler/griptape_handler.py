@@ -1,101 +1,224 @@
 from __future__ import annotations
 
+import atexit
+import functools
 import json
 import logging
+import queue
 import re
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from typing import TYPE_CHECKING, Optional
 
-from griptape.artifacts import ErrorArtifact, TextArtifact
-from griptape.drivers import GriptapeCloudRulesetDriver
-from griptape.drivers.prompt.griptape_cloud_prompt_driver import GriptapeCloudPromptDriver
-from griptape.events import EventBus
-from griptape.memory.structure import ConversationMemory, Run
-from griptape.rules import JsonSchemaRule, Rule, Ruleset
-from griptape.structures import Agent
-from schema import Literal, Schema
-
-from griptape_structure_slack_handler.griptape_event_handlers import ToolEvent
-
-from .features import dynamic_rulesets_enabled, dynamic_tools_enabled
-from .griptape_config import load_griptape_config, set_thread_alias
-from .griptape_tool_box import get_tools
+from .features import dynamic_rulesets_enabled, dynamic_tools_enabled, prewarm_enabled
+from .griptape_config import get_conversation_memory_driver, load_griptape_config
+from .griptape_tool_box import _init_tools_dict, get_tools
 
 if TYPE_CHECKING:
     from griptape.events import EventListener
+    from griptape.rules import Ruleset
+    from griptape.structures import Agent
+
+
+logger = logging.getLogger(__name__)
+
+# Griptape is imported lazily and configured on the first request to keep cold starts fast
+_configured = False
+_configure_lock = threading.Lock()
 
+# Ruleset lookups for @ mentions are HTTPS bound, so they are issued concurrently
+_mention_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="mention-lookup")
+_MENTION_RE = re.compile(r"<@(\w+)>")
+_DEFAULT_RULESET_IDS = (
+    # Knowledge Base Ruleset
+    "f5a9c72b-b367-403e-9872-cdd85431e898",
+    # Slack Personality Ruleset
+    "60a368ef-f5ac-4c63-990c-80a7364a22a0",
+    # Zach Prime ID Ruleset
+    "6f35283b-e336-433b-84dd-9ee53e8c69bf",
+    # Slack Formatting Ruleset
+    "b2cae474-a25c-476b-90a1-f39d588dd711",
+    # Slack Tool Ruleset
+    "31b9d849-dade-4c3f-ac31-377ff6f02307",
+)
+_default_rulesets: Optional[tuple[Ruleset, ...]] = None
+_default_rulesets_lock = threading.Lock()
+# Idle relevance Agents. Their configuration is constant, so they are reused instead of rebuilt on every call
+_idle_relevance_agents: list[Agent] = []
+_relevance_agents_lock = threading.Lock()
+_RESPOND_RE = re.compile(r'"should_respond"\s*:\s*(true|false)')
 
-logger = logging.getLogger()
+# Messages for try_add_to_thread, as (message, thread_alias, user_id), written to their threads in the background
+_pending_thread_messages: queue.Queue[tuple[str, Optional[str], str]] = queue.Queue()
+_THREAD_WRITE_INTERVAL = 0.1
+_thread_writer_stop = threading.Event()
+# Messages whose thread was busy on the last write, retried first so they stay in order. Only the writer touches it
+_deferred_thread_messages: dict[Optional[str], list[tuple[str, str]]] = {}
 
+# The cloud conversation memory driver replaces a thread's whole message list on store, so every load/store
+# of a thread's memory is serialized with these locks, otherwise concurrent writers overwrite each other's runs
+_thread_locks = tuple(threading.Lock() for _ in range(64))
 
-load_griptape_config()
+
+def _ensure_configured() -> None:
+    global _configured
+    if _configured:
+        return
+    with _configure_lock:
+        if not _configured:
+            load_griptape_config()
+            _configured = True
 
 
 def try_add_to_thread(message: str, *, thread_alias: Optional[str] = None, user_id: str) -> None:
-    set_thread_alias(thread_alias)
-    # find all the user_ids @ mentions in the message
-    mentioned_user_ids = re.findall(r"<@([\w]+)>", message)
-    rulesets = [Ruleset(name=mentioned_user) for mentioned_user in mentioned_user_ids]
-    for ruleset in rulesets:
+    """
+    Queues the message to be added to the thread. The write happens on a background thread,
+    so the Slack event can be acknowledged without waiting on Griptape Cloud.
+    """
+    _pending_thread_messages.put_nowait((message, thread_alias, user_id))
+
+
+def _thread_lock(thread_alias: Optional[str]) -> threading.Lock:
+    return _thread_locks[hash(thread_alias) % len(_thread_locks)]
+
+
+def _write_thread_messages() -> None:
+    while not _thread_writer_stop.wait(_THREAD_WRITE_INTERVAL):
+        _write_pending_thread_messages(block=False)
+    _write_pending_thread_messages(block=True)
+
+
+def _write_pending_thread_messages(*, block: bool) -> None:
+    messages_by_alias = {**_deferred_thread_messages}
+    _deferred_thread_messages.clear()
+    while True:
+        try:
+            message, thread_alias, user_id = _pending_thread_messages.get_nowait()
+        except queue.Empty:
+            break
+        messages_by_alias.setdefault(thread_alias, []).append((message, user_id))
+
+    for thread_alias, messages in messages_by_alias.items():
+        lock = _thread_lock(thread_alias)
+        # don't hold up other threads while an Agent is responding in this one, retry it on the next tick instead
+        if not lock.acquire(blocking=block):
+            _deferred_thread_messages[thread_alias] = messages
+            continue
+        try:
+            _add_to_thread(messages, thread_alias=thread_alias)
+        except Exception:
+            logger.exception("Error while adding messages to thread")
+        finally:
+            lock.release()
+
+
+def _add_to_thread(messages: list[tuple[str, str]], *, thread_alias: Optional[str]) -> None:
+    from griptape.artifacts import TextArtifact
+    from griptape.memory.structure import ConversationMemory, Run
+
+    _ensure_configured()
+    runs = []
+    for message, user_id in messages:
+        # find all the user_ids @ mentions in the message
+        mentioned_user_ids = _MENTION_RE.findall(message) if "<@" in message else []
         # If the message is mentioning the bot, don't add it to the memory
         # because the bot will already be responding to the message,
         # and the message will be in conversation memory already
-        if ruleset.meta.get("type") == "bot":
-            return
-
-    memory = ConversationMemory()
-    # WIP. since messages that do not tag the bot are not being added to the cloud Thread,
-    # the bot can miss context. This inserts those messages into the Thread, which
-    # later can be used to provide context via ConversationMemory. this seems to work okay,
-    # but it can confuse the LLM
-    memory.add_run(
-        Run(
-            input=TextArtifact(
-                f"Do not respond. Only use this message for future context. Message: 'user {user_id}: {message}'"
-            ),
-            output=TextArtifact(""),
+        if _mentions_bot(mentioned_user_ids):
+            continue
+
+        # WIP. since messages that do not tag the bot are not being added to the cloud Thread,
+        # the bot can miss context. This inserts those messages into the Thread, which
+        # later can be used to provide context via ConversationMemory. this seems to work okay,
+        # but it can confuse the LLM
+        runs.append(
+            Run(
+                input=TextArtifact(
+                    f"Do not respond. Only use this message for future context. Message: 'user {user_id}: {message}'"
+                ),
+                output=TextArtifact(""),
+            )
         )
-    )
+
+    if not runs:
+        return
+
+    # add the whole batch with a single store, rather than one per run via add_run
+    memory = ConversationMemory(conversation_memory_driver=get_conversation_memory_driver(thread_alias))
+    memory.runs.extend(runs)
+    memory.conversation_memory_driver.store(memory.runs, memory.meta)
+
+
+def _stop_thread_writer() -> None:
+    """
+    Stops the background thread writer, waiting for it to flush any queued messages so none are lost at exit.
+    """
+    pending = _pending_thread_messages.qsize()
+    if pending:
+        logger.info(f"Flushing {pending} queued thread message(s) before exit")
+    _thread_writer_stop.set()
+    _thread_writer.join()
+
+
+def _mentions_bot(user_ids: list[str]) -> bool:
+    """
+    Whether any of the users is a bot. Lookups run concurrently and stop at the first bot found.
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    if len(user_ids) <= 1:
+        return any(_is_bot_user(user_id) for user_id in user_ids)
+
+    try:
+        futures = [_mention_executor.submit(_is_bot_user, user_id) for user_id in user_ids]
+    except RuntimeError:
+        # the executor refuses new work once the interpreter is shutting down,
+        # which is when the thread writer does its final flush
+        return any(_is_bot_user(user_id) for user_id in user_ids)
+    try:
+        return any(future.result() for future in as_completed(futures))
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+@functools.lru_cache(maxsize=1024)
+def _is_bot_user(user_id: str) -> bool:
+    """
+    Whether the user's Ruleset is marked as a bot. Cached since the same users are mentioned repeatedly.
+    """
+    from griptape.rules import Ruleset
+
+    return Ruleset(name=user_id).meta.get("type") == "bot"
 
 
 def get_rulesets(**kwargs) -> list[Ruleset]:
-    rulesets = [Ruleset(name=value) for value in kwargs.values()] if dynamic_rulesets_enabled() else []
-    rulesets.extend(_get_default_rulesets())
-    return rulesets
+    from griptape.rules import Ruleset
 
+    _ensure_configured()
+    dynamic_rulesets = [Ruleset(name=value) for value in kwargs.values()] if dynamic_rulesets_enabled() else []
+    return [*dynamic_rulesets, *_get_default_rulesets()]
 
-def _get_default_rulesets() -> list[Ruleset]:
-    return [
-        # Knowledge Base Ruleset
-        Ruleset(
-            ruleset_driver=GriptapeCloudRulesetDriver(
-                raise_not_found=True, ruleset_id="f5a9c72b-b367-403e-9872-cdd85431e898"
-            ),
-        ),
-        # Slack Personality Ruleset
-        Ruleset(
-            ruleset_driver=GriptapeCloudRulesetDriver(
-                raise_not_found=True, ruleset_id="60a368ef-f5ac-4c63-990c-80a7364a22a0"
-            ),
-        ),
-        # Zach Prime ID Ruleset
-        Ruleset(
-            ruleset_driver=GriptapeCloudRulesetDriver(
-                raise_not_found=True, ruleset_id="6f35283b-e336-433b-84dd-9ee53e8c69bf"
-            ),
-        ),
-        # Slack Formatting Ruleset
-        Ruleset(
-            ruleset_driver=GriptapeCloudRulesetDriver(
-                raise_not_found=True, ruleset_id="b2cae474-a25c-476b-90a1-f39d588dd711"
-            ),
-        ),
-        # Slack Tool Ruleset
-        Ruleset(
-            ruleset_driver=GriptapeCloudRulesetDriver(
-                raise_not_found=True, ruleset_id="31b9d849-dade-4c3f-ac31-377ff6f02307"
-            ),
-        ),
-    ]
+
+def _get_default_rulesets() -> tuple[Ruleset, ...]:
+    """
+    Loads the default Rulesets on first use and keeps them for the life of the process.
+    """
+    global _default_rulesets
+    if _default_rulesets is not None:
+        return _default_rulesets
+
+    from griptape.drivers import GriptapeCloudRulesetDriver
+    from griptape.rules import Ruleset
+
+    with _default_rulesets_lock:
+        if _default_rulesets is None:
+            _default_rulesets = tuple(
+                Ruleset(ruleset_driver=GriptapeCloudRulesetDriver(raise_not_found=True, ruleset_id=ruleset_id))
+                for ruleset_id in _DEFAULT_RULESET_IDS
+            )
+    return _default_rulesets
 
 
 def agent(
@@ -107,55 +230,155 @@ def agent(
     event_listeners: list[EventListener],
     stream: bool,
 ) -> str:
-    set_thread_alias(thread_alias)
-    dynamic_tools = dynamic_tools_enabled() or any([ruleset.meta.get("dynamic_tools", False) for ruleset in rulesets])
-    tools = get_tools(message, dynamic=dynamic_tools)
+    from griptape.artifacts import ErrorArtifact
+    from griptape.drivers.prompt.griptape_cloud_prompt_driver import GriptapeCloudPromptDriver
+    from griptape.events import EventBus
+    from griptape.memory.structure import ConversationMemory
+    from griptape.structures import Agent
+
+    from .griptape.tool_event import ToolEvent
+
+    _ensure_configured()
+    dynamic_tools = dynamic_tools_enabled() or any(ruleset.meta.get("dynamic_tools", False) for ruleset in rulesets)
+    tools = get_tools(message, thread_alias=thread_alias, dynamic=dynamic_tools)
+    with _scoped_event_listeners(event_listeners):
+        if dynamic_tools:
+            EventBus.publish_event(ToolEvent(tools=tools, stream=stream), flush=True)
+
+        with _thread_lock(thread_alias):
+            agent = Agent(
+                input="user_id '<@{{ args[0] }}>': {{ args[1] }}",
+                tools=tools,
+                rulesets=rulesets,
+                stream=stream,
+                prompt_driver=GriptapeCloudPromptDriver(model="gpt-5"),
+                conversation_memory=ConversationMemory(
+                    conversation_memory_driver=get_conversation_memory_driver(thread_alias),
+                ),
+            )
+            output = agent.run(user_id, message).output
+    text = output.to_text()
+    if isinstance(output, ErrorArtifact):
+        raise ValueError(text)
+    return text
+
+
+@contextmanager
+def _scoped_event_listeners(event_listeners: list[EventListener]) -> Iterator[None]:
+    """
+    Registers the event listeners on the global EventBus for the duration of the block,
+    so they don't accumulate across requests.
+    """
+    if not event_listeners:
+        yield
+        return
+
+    from griptape.events import EventBus
+
     EventBus.add_event_listeners(event_listeners)
+    try:
+        yield
+    finally:
+        EventBus.remove_event_listeners(event_listeners)
 
-    if dynamic_tools:
-        EventBus.publish_event(ToolEvent(tools=tools, stream=stream), flush=True)
 
-    agent = Agent(
-        input="user_id '<@{{ args[0] }}>': {{ args[1] }}",
-        tools=tools,
-        rulesets=rulesets,
-        stream=stream,
-        prompt_driver=GriptapeCloudPromptDriver(model="gpt-5"),
-    )
-    output = agent.run(user_id, message).output
+def is_relevant_response(message: str, response: str, *, thread_alias: Optional[str] = None) -> bool:
+    from griptape.artifacts import ErrorArtifact
+
+    _ensure_configured()
+    with _relevance_agents_lock:
+        agent = _idle_relevance_agents.pop() if _idle_relevance_agents else None
+    if agent is None:
+        agent = _build_relevance_agent()
+
+    with _thread_lock(thread_alias):
+        _load_conversation_memory(agent, thread_alias)
+        output = agent.run(message, response).output
+    # only reuse the Agent if the run didn't raise
+    with _relevance_agents_lock:
+        _idle_relevance_agents.append(agent)
+
+    text = output.to_text()
     if isinstance(output, ErrorArtifact):
-        raise ValueError(output.to_text())
-    return output.to_text()
+        raise ValueError(text)
+    match = _RESPOND_RE.search(text)
+    if match is not None:
+        return match.group(1) == "true"
+    return json.loads(text)["should_respond"]
+
 
+def _build_relevance_agent() -> Agent:
+    from griptape.drivers.prompt.griptape_cloud_prompt_driver import GriptapeCloudPromptDriver
+    from griptape.memory.structure import ConversationMemory
+    from griptape.structures import Agent
 
-def is_relevant_response(message: str, response: str) -> bool:
-    agent = Agent(
+    return Agent(
         prompt_driver=GriptapeCloudPromptDriver(model="gpt-4.1"),
         input="Given the following message: '{{ args[0] }}', is the following response helpful and relevant? Response: {{ args[1] }}",
-        rulesets=[
-            Ruleset(
-                rules=[
-                    Rule("You should respond if the response is helpful and relevant to the user"),
-                    Rule(
-                        "If the message is a question, the response should be shown to the user if the response is helpful and relevant."
-                    ),
-                    JsonSchemaRule(
-                        Schema(
-                            {
-                                Literal(
-                                    "should_respond",
-                                    description="Boolean value that determines if the given agent response should be sent to the user.",
-                                ): bool
-                            }
-                        ).json_schema("should_respond")
-                    ),
-                ]
-            )
-        ],
+        rulesets=[_get_relevance_ruleset()],
         stream=False,
+        conversation_memory=ConversationMemory(autoload=False),
     )
 
-    output = agent.run(message, response).output
-    if isinstance(output, ErrorArtifact):
-        raise ValueError(output.to_text())
-    return json.loads(output.to_text())["should_respond"]
+
+def _load_conversation_memory(agent: Agent, thread_alias: Optional[str]) -> None:
+    """
+    Points a reused Agent's conversation memory at the thread and replaces any runs left over from its last use.
+    """
+    memory = agent.conversation_memory
+    if memory is None:
+        raise ValueError("Reused Agents must be built with conversation memory")
+    memory.conversation_memory_driver = get_conversation_memory_driver(thread_alias)
+    memory.runs = []
+    memory.meta = {}
+    memory.load_runs()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_relevance_ruleset() -> Ruleset:
+    """
+    The relevance Ruleset is constant, so build it once instead of on every call.
+    """
+    from griptape.rules import JsonSchemaRule, Rule, Ruleset
+    from schema import Literal, Schema
+
+    return Ruleset(
+        rules=[
+            Rule("You should respond if the response is helpful and relevant to the user"),
+            Rule(
+                "If the message is a question, the response should be shown to the user if the response is helpful and relevant."
+            ),
+            JsonSchemaRule(
+                Schema(
+                    {
+                        Literal(
+                            "should_respond",
+                            description="Boolean value that determines if the given agent response should be sent to the user.",
+                        ): bool
+                    }
+                ).json_schema("should_respond")
+            ),
+        ]
+    )
+
+
+def _prewarm() -> None:
+    """
+    Builds the cached config, default Rulesets and Tools ahead of the first request.
+    Failures are only logged, since the first request will retry them.
+    """
+    try:
+        _ensure_configured()
+        _get_default_rulesets()
+        _init_tools_dict()
+    except Exception:
+        logger.exception("Error while prewarming Griptape")
+
+
+if prewarm_enabled():
+    threading.Thread(target=_prewarm, name="griptape-prewarm", daemon=True).start()
+
+
+_thread_writer = threading.Thread(target=_write_thread_messages, name="thread-writer", daemon=True)
+_thread_writer.start()
+atexit.register(_stop_thread_writer)
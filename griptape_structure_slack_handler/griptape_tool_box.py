@@ -1,33 +1,62 @@
+from __future__ import annotations
+
+import functools
 import logging
 import os
+import re
+import threading
+from typing import TYPE_CHECKING, Optional
+
+from .features import llm_tool_routing_enabled, tool_similarity_threshold
+from .griptape_config import get_conversation_memory_driver
 
-from griptape.drivers import GriptapeCloudPromptDriver, GriptapeCloudVectorStoreDriver
-from griptape.engines.rag import RagEngine
-from griptape.engines.rag.modules import (
-    TextChunksResponseRagModule,
-    VectorStoreRetrievalRagModule,
-)
-from griptape.engines.rag.stages import ResponseRagStage, RetrievalRagStage
-from griptape.rules import Rule
-from griptape.structures import Agent
-from griptape.tasks import PromptTask
-from griptape.tools import BaseTool, GriptapeCloudToolTool, RagTool
+if TYPE_CHECKING:
+    import numpy as np
+    from griptape.tools import BaseTool, RagTool
 
-from .griptape.read_only_conversation_memory import ReadOnlyConversationMemory
+logger = logging.getLogger(__name__)
 
-logger = logging.getLogger()
+_TOOL_NAME_RE = re.compile(r"[a-zA-Z_]\w+")
+_tools_dict: Optional[dict[str, tuple[BaseTool, str]]] = None
+_tools_dict_lock = threading.Lock()
 
 
-def get_tools(message: str, *, dynamic: bool = False) -> list[BaseTool]:
+def get_tools(message: str, *, thread_alias: Optional[str] = None, dynamic: bool = False) -> list[BaseTool]:
     """
-    Gets tools for the Agent to use. if dynamic=True, the LLM will decide what tools to use
-    based on the user input and the conversation history.
+    Gets tools for the Agent to use. if dynamic=True, tools are chosen by the similarity
+    of their descriptions to the user input. If the LLM_TOOL_ROUTING feature is enabled,
+    the LLM will instead decide what tools to use based on the user input and the conversation history.
+    The non-dynamic list is shared between calls, so callers must not mutate it.
     """
-    tools_dict = _init_tools_dict()
     if not dynamic:
-        return [tool for tool, _ in tools_dict.values()]
+        return _get_all_tools()
+
+    tools_dict = _init_tools_dict()
+    # Only the names are cached by the routers, since Tool objects may hold per-request state
+    if llm_tool_routing_enabled():
+        tool_names = _get_llm_tool_names(message, thread_alias=thread_alias)
+    else:
+        tool_names = _get_similar_tool_names(message, threshold=tool_similarity_threshold())
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(f"Tools needed: {tool_names}")
+    return [tools_dict[tool_name][0] for tool_name in tool_names]
+
+
+@functools.lru_cache(maxsize=256)
+def _get_similar_tool_names(message: str, *, threshold: float) -> tuple[str, ...]:
+    tool_names, tool_embeddings = _get_tool_embeddings()
+    similarities = tool_embeddings @ _embed(message)
+    return tuple(tool_name for tool_name, similarity in zip(tool_names, similarities) if similarity >= threshold)
+
 
-    tools_descriptions = {k: description for k, (_, description) in tools_dict.items()}
+@functools.lru_cache(maxsize=256)
+def _get_llm_tool_names(message: str, *, thread_alias: Optional[str]) -> tuple[str, ...]:
+    from griptape.drivers import GriptapeCloudPromptDriver
+    from griptape.rules import Rule
+    from griptape.structures import Agent
+    from griptape.tasks import PromptTask
+
+    from .griptape.read_only_conversation_memory import ReadOnlyConversationMemory
 
     agent = Agent(
         prompt_driver=GriptapeCloudPromptDriver(model="gpt-5"),
@@ -42,15 +71,66 @@ def get_tools(message: str, *, dynamic: bool = False) -> list[BaseTool]:
                 ],
             ),
         ],
-        conversation_memory=ReadOnlyConversationMemory(),
+        conversation_memory=ReadOnlyConversationMemory(
+            conversation_memory_driver=get_conversation_memory_driver(thread_alias),
+        ),
     )
+    tools_descriptions = _get_tool_descriptions()
     output = agent.run(message, tools_descriptions).output.value
-    tool_names = output.split(",") if output != "None" else []
-    logger.info(f"Tools needed: {tool_names}")
-    return [tools_dict[tool_name.strip()][0] for tool_name in tool_names]
+    # only keep names of real tools, so 'None', prose or hallucinated names around the list are ignored
+    return tuple(dict.fromkeys(name for name in _TOOL_NAME_RE.findall(output) if name in tools_descriptions))
+
+
+@functools.lru_cache(maxsize=1)
+def _get_all_tools() -> list[BaseTool]:
+    return [tool for tool, _ in _init_tools_dict().values()]
+
+
+@functools.lru_cache(maxsize=1)
+def _get_tool_descriptions() -> dict[str, str]:
+    return {k: description for k, (_, description) in _init_tools_dict().items()}
+
+
+@functools.lru_cache(maxsize=1)
+def _get_tool_embeddings() -> tuple[list[str], np.ndarray]:
+    """
+    Embeds every Tool once per process, as "<tool name>: <description>" so that Tools sharing a description
+    can still be told apart.
+    Returns the Tool names and a matrix with one unit-length embedding per row, in the same order.
+    """
+    import numpy as np
+
+    tools_descriptions = _get_tool_descriptions()
+    tool_embeddings = np.array([_embed(f"{name}: {description}") for name, description in tools_descriptions.items()])
+    tool_embeddings.setflags(write=False)
+    return list(tools_descriptions), tool_embeddings
+
+
+@functools.lru_cache(maxsize=1024)
+def _embed(text: str) -> np.ndarray:
+    """
+    Embeds the text with the default embedding driver, normalized to unit length
+    so that dot products are cosine similarities.
+    """
+    import numpy as np
+    from griptape.configs import Defaults
+
+    embedding = np.array(Defaults.drivers_config.embedding_driver.embed(text), dtype=float)
+    embedding /= np.linalg.norm(embedding)
+    embedding.setflags(write=False)
+    return embedding
 
 
 def _get_knowledge_base_tool(name: str, env_var: str) -> RagTool:
+    from griptape.drivers import GriptapeCloudVectorStoreDriver
+    from griptape.engines.rag import RagEngine
+    from griptape.engines.rag.modules import (
+        TextChunksResponseRagModule,
+        VectorStoreRetrievalRagModule,
+    )
+    from griptape.engines.rag.stages import ResponseRagStage, RetrievalRagStage
+    from griptape.tools import RagTool
+
     vector_store_driver = GriptapeCloudVectorStoreDriver(
         knowledge_base_id=os.getenv(env_var, ""),
     )
@@ -66,6 +146,7 @@ def _get_knowledge_base_tool(name: str, env_var: str) -> RagTool:
         name=name,
         rag_engine=rag_engine,
         description="Knowledge Base with information about Griptape Operational Processes",
+        input_memory=[],
     )
 
 
@@ -74,8 +155,25 @@ def _init_tools_dict() -> dict[str, tuple[BaseTool, str]]:
     Initializes the tools dictionary.
     The return value is a dictionary where the key is the tool name
     and the value is a tuple containing the Tool object and a description
-    of what the tool can do
+    of what the tool can do.
+    The dictionary is built once per process and shared, so callers must not mutate it.
+    Every Tool is built with input_memory=[], otherwise the first Agent to use it would attach
+    its own TaskMemory and pin it to the Tool for every later request.
     """
+    global _tools_dict
+    if _tools_dict is not None:
+        return _tools_dict
+
+    # built under a lock, so a request racing the prewarm thread doesn't fetch the Tools a second time
+    with _tools_dict_lock:
+        if _tools_dict is None:
+            _tools_dict = _build_tools_dict()
+    return _tools_dict
+
+
+def _build_tools_dict() -> dict[str, tuple[BaseTool, str]]:
+    from griptape.tools import GriptapeCloudToolTool
+
     # TODO: Add other tools here
     rv_knowledge_base_tool = _get_knowledge_base_tool("rvKB", "RV_KNOWLEDGE_BASE_ID")
     truck_knowledge_base_tool = _get_knowledge_base_tool("truckKB", "TRUCK_KNOWLEDGE_BASE_ID")
@@ -96,12 +194,14 @@ def _init_tools_dict() -> dict[str, tuple[BaseTool, str]]:
         "github_tool": (
             GriptapeCloudToolTool(
                 tool_id=os.getenv("GT_CLOUD_GITHUB_TOOL_ID", "fb56b523-ec53-4490-937e-013ef0f16299"),
+                input_memory=[],
             ),
             "Intelligent GitHub agent with access to the Griptape and Griptape Cloud repository. Use when asked about the Griptape Framework or Griptape Cloud repository, or GitHub related questions.",
         ),
         "slack_tool": (
             GriptapeCloudToolTool(
                 tool_id=os.getenv("GT_CLOUD_SLACK_TOOL_ID", "17f0ef8c-a5e2-4c2a-8f15-533691225195"),
+                input_memory=[],
             ),
             "Tool with access to Slack APIs.",
         ),
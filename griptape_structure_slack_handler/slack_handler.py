@@ -9,7 +9,6 @@ from .features import (
     stream_output_enabled,
     thread_history_enabled,
 )
-from .griptape_event_handlers import event_listeners
 from .griptape_handler import (
     agent,
     get_rulesets,
@@ -84,7 +83,7 @@ def shadow_respond_in_thread(body: dict, payload: dict, say: Say, client: WebCli
         logger.exception("Error while processing response")
         return
 
-    if is_relevant_response(payload["text"], agent_output):
+    if is_relevant_response(payload["text"], agent_output, thread_alias=thread_ts):
         logger.info("Shadow response is relevant, sending")
         for blocks in markdown_blocks_list(agent_output):
             client.chat_postMessage(
@@ -98,6 +97,9 @@ def shadow_respond_in_thread(body: dict, payload: dict, say: Say, client: WebCli
 
 
 def respond_in_thread(body: dict, payload: dict, say: Say, client: WebClient):
+    # imported here since it pulls in Griptape, which is only needed once an event arrives
+    from .griptape_event_handlers import event_listeners
+
     team_id = body["team_id"]
     app_id = body["api_app_id"]
     thread_ts = payload.get("thread_ts", payload["ts"])
@@ -117,7 +119,7 @@ def respond_in_thread(body: dict, payload: dict, say: Say, client: WebClient):
         )
         # wip, if any rulesets have stream=True, then stream the response
         # changes the slack app behavior. any truthy value will work
-        stream = stream or any([ruleset.meta.get("stream", False) for ruleset in rulesets])
+        stream = stream or any(ruleset.meta.get("stream", False) for ruleset in rulesets)
 
         agent_output = agent(
             payload["text"],